@@ -5,16 +5,31 @@ This version uses subprocess calls to external tools, avoiding AGPL dependencies
 """
 
 import argparse
+import hashlib
+import io
 import json
+import mmap
+import os
 import re
 import sys
 import subprocess
 import tempfile
+from concurrent.futures import ProcessPoolExecutor
 import shutil
 from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import logging
 
+try:
+    import ahocorasick  # optional, single-pass multi-pattern matching
+except ImportError:
+    ahocorasick = None
+
+try:
+    import hyperscan  # optional, single-pass multi-regex DFA matching
+except ImportError:
+    hyperscan = None
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -22,10 +37,17 @@ logger = logging.getLogger(__name__)
 class PDFRedactorTools:
     """PDF text redaction using external tools"""
     
-    def __init__(self):
+    def __init__(self, check_tools: bool = True):
         self.replacements = []
+        self._automatons = None  # rebuilt lazily when rules change
+        self._char_table = None  # str.translate table for 1-char rules
+        self._table_chars = frozenset()  # chars the table covers
+        self._table_after_regex = False  # run the table after the regex pass
+        self._combined_literal_b = None  # (pattern, replacements) for bytes
+        self._hs_db = None  # (hyperscan db, replacements) for regex rules
         self.required_tools = ['qpdf', 'pdftotext', 'ps2pdf']
-        self.check_tools()
+        if check_tools:
+            self.check_tools()
     
     def check_tools(self):
         """Check if required external tools are installed"""
@@ -44,12 +66,137 @@ class PDFRedactorTools:
     
     def add_replacement(self, find: str, replace: str, is_regex: bool = False, case_insensitive: bool = False):
         """Add a replacement rule"""
-        self.replacements.append({
+        # Multi-pattern 'find' arrays repeat the same replacement string
+        # across expanded rules; interning collapses the copies to one
+        # object and turns later equality checks into pointer compares
+        find = sys.intern(find)
+        replace = sys.intern(replace)
+        rule = {
             'find': find,
             'replace': replace,
             'regex': is_regex,
             'caseInsensitive': case_insensitive
-        })
+        }
+        if is_regex:
+            # Compile once here instead of once per document per rule
+            rule['_pat'] = re.compile(find, re.IGNORECASE if case_insensitive else 0)
+        elif case_insensitive:
+            # Precompile a literal pattern so the case-insensitive scan runs
+            # in the regex engine instead of a Python-level find loop
+            rule['_ci_pat'] = re.compile(re.escape(find), re.IGNORECASE)
+
+        # Byte-level twins for the PDF/PostScript stream paths; latin-1 is a
+        # byte-identity encoding, so rules that encode can run on raw bytes
+        # with no decode/encode round-trip. Rules that don't encode cannot
+        # occur literally in a byte stream.
+        try:
+            rule['_find_b'] = find.encode('latin-1')
+            rule['_replace_b'] = replace.encode('latin-1')
+        except UnicodeEncodeError:
+            rule['_find_b'] = None
+            rule['_replace_b'] = None
+        else:
+            if is_regex:
+                rule['_pat_b'] = re.compile(
+                    rule['_find_b'], re.IGNORECASE if case_insensitive else 0)
+            elif case_insensitive:
+                rule['_ci_pat_b'] = re.compile(
+                    re.escape(rule['_find_b']), re.IGNORECASE)
+
+        self.replacements.append(rule)
+        self._automatons = None
+        self._char_table = None
+        self._table_chars = frozenset()
+        self._combined_literal_b = None
+        self._hs_db = None
+
+    @staticmethod
+    def _is_char_rule(rule: Dict) -> bool:
+        """True for 1-char -> 1-char case-sensitive literal rules"""
+        return (not rule['regex'] and not rule.get('caseInsensitive', False)
+                and len(rule['find']) == 1 and len(rule['replace']) == 1)
+
+    def _build_char_table(self):
+        """Build a str.translate table covering all single-char rules
+
+        Collapsing them into one table means one traversal of the text
+        regardless of how many such rules exist (common when zeroing out
+        digits). The table runs before the multi-char pass, so chars that
+        also occur inside a longer literal needle are left out - translating
+        them first would destroy the longer match (a "1"->"X" rule must not
+        break "123-45-6789"); those rules take the ordinary literal paths.
+        When regex rules exist the whole table is deferred until after the
+        regex pass for the same reason (see process_text).
+        Returns (table or None, covered chars).
+        """
+        longer_needles = [
+            (rule['find'].lower(), True) if rule.get('caseInsensitive', False)
+            else (rule['find'], False)
+            for rule in self.replacements
+            if not rule['regex'] and not self._is_char_rule(rule)
+        ]
+        chars = {}
+        for rule in self.replacements:
+            if not self._is_char_rule(rule):
+                continue
+            ch = rule['find']
+            if any(ch.lower() in needle if ci else ch in needle
+                   for needle, ci in longer_needles):
+                continue
+            chars[ch] = rule['replace']
+        if not chars:
+            return None, frozenset()
+        return str.maketrans(chars), frozenset(chars)
+
+    def _build_automatons(self):
+        """Build one Aho-Corasick automaton per case class of literal rules
+
+        Returns a list of (automaton, case_insensitive) pairs, or an empty
+        list when pyahocorasick is not installed.
+        """
+        if ahocorasick is None:
+            return []
+
+        automatons = []
+        for case_insensitive in (False, True):
+            automaton = ahocorasick.Automaton()
+            count = 0
+            for rule in self.replacements:
+                if rule['regex'] or rule.get('caseInsensitive', False) != case_insensitive:
+                    continue
+                if rule['find'] in self._table_chars:
+                    continue  # handled by the translate table
+                key = rule['find'].lower() if case_insensitive else rule['find']
+                automaton.add_word(key, (len(key), rule['replace']))
+                count += 1
+            if count:
+                automaton.make_automaton()
+                automatons.append((automaton, case_insensitive))
+        return automatons
+
+    def _apply_automaton(self, text: str, automaton, case_insensitive: bool) -> str:
+        """Replace all automaton matches in a single pass over the text"""
+        haystack = text.lower() if case_insensitive else text
+        matches = []
+        for end_index, (length, replace) in automaton.iter(haystack):
+            start = end_index - length + 1
+            matches.append((start, end_index + 1, replace))
+
+        if not matches:
+            return text
+
+        # Resolve overlaps left-to-right, longest match wins
+        matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+        parts = []
+        pos = 0
+        for start, end, replace in matches:
+            if start < pos:
+                continue
+            parts.append(text[pos:start])
+            parts.append(replace)
+            pos = end
+        parts.append(text[pos:])
+        return ''.join(parts)
     
     def load_config(self, config_path: str):
         """Load replacement rules from configuration file"""
@@ -59,10 +206,11 @@ class PDFRedactorTools:
         for rule in config.get('replacements', []):
             # Support both single string and array of strings for 'find'
             find_patterns = rule['find']
-            if isinstance(find_patterns, str):
+            find_type = type(find_patterns)
+            if find_type is str:
                 # Single pattern (backward compatibility)
                 find_patterns = [find_patterns]
-            elif not isinstance(find_patterns, list):
+            elif find_type is not list:
                 raise ValueError(f"Invalid 'find' value: {find_patterns}. Must be string or array of strings.")
             
             # Create replacement rule for each pattern
@@ -74,59 +222,246 @@ class PDFRedactorTools:
                     rule.get('caseInsensitive', False)
                 )
     
+    def _apply_rule(self, content: str, rule: Dict) -> Tuple[str, bool]:
+        """Apply a single replacement rule, returning (content, changed)
+
+        Shared by process_text and process_postscript so both honor the
+        regex and caseInsensitive flags identically. Literal case-sensitive
+        rules use str.replace, which is faster than the regex engine.
+        """
+        if rule['regex']:
+            if not rule['_pat'].search(content):
+                return content, False
+            return rule['_pat'].sub(rule['replace'], content), True
+
+        # A literal needle longer than the haystack can never match
+        if len(rule['find']) > len(content):
+            return content, False
+
+        if rule.get('caseInsensitive', False):
+            if not rule['_ci_pat'].search(content):
+                return content, False
+            # A lambda keeps the replacement literal (no backreferences)
+            replace_text = rule['replace']
+            return rule['_ci_pat'].sub(lambda m: replace_text, content), True
+
+        if rule['find'] not in content:
+            return content, False
+        return content.replace(rule['find'], rule['replace']), True
+
+    def _apply_rule_bytes(self, content: bytes, rule: Dict) -> Tuple[bytes, bool]:
+        """Byte-level counterpart of _apply_rule for stream processing"""
+        find_b = rule['_find_b']
+        if find_b is None:
+            return content, False
+
+        if rule['regex']:
+            if not rule['_pat_b'].search(content):
+                return content, False
+            return rule['_pat_b'].sub(rule['_replace_b'], content), True
+
+        # A literal needle longer than the haystack can never match
+        if len(find_b) > len(content):
+            return content, False
+
+        if rule.get('caseInsensitive', False):
+            if not rule['_ci_pat_b'].search(content):
+                return content, False
+            replace_b = rule['_replace_b']
+            return rule['_ci_pat_b'].sub(lambda m: replace_b, content), True
+
+        if find_b not in content:
+            return content, False
+        return content.replace(find_b, rule['_replace_b']), True
+
+    def _any_match(self, text: str) -> bool:
+        """Return True as soon as any rule matches the text
+
+        Cheaper than process_text when only a yes/no answer is needed: no
+        replacement string is ever built and the scan stops at the first hit.
+        """
+        for rule in self.replacements:
+            if rule['regex']:
+                if rule['_pat'].search(text):
+                    return True
+            elif rule.get('caseInsensitive', False):
+                if rule['_ci_pat'].search(text):
+                    return True
+            elif rule['find'] in text:
+                return True
+        return False
+
+    def _buffer_has_matches(self, buf) -> bool:
+        """Check whether any rule matches a bytes-like buffer (e.g. mmap)"""
+        for rule in self.replacements:
+            if rule['_find_b'] is None:
+                continue
+            if rule['regex']:
+                if rule['_pat_b'].search(buf):
+                    return True
+            elif rule.get('caseInsensitive', False):
+                if rule['_ci_pat_b'].search(buf):
+                    return True
+            elif buf.find(rule['_find_b']) != -1:
+                return True
+        return False
+
+    def _apply_literal_rules(self, text: str) -> str:
+        """Apply all literal (non-regex) rules to text
+
+        With pyahocorasick installed all literal rules are matched in a
+        single pass per case class; otherwise fall back to one scan per rule.
+        """
+        result = text
+
+        if self._automatons is None:
+            self._char_table, self._table_chars = self._build_char_table()
+            self._table_after_regex = any(rule['regex']
+                                          for rule in self.replacements)
+            self._automatons = self._build_automatons()
+
+        if self._char_table is not None and not self._table_after_regex:
+            result = result.translate(self._char_table)
+
+        if self._automatons:
+            for automaton, case_insensitive in self._automatons:
+                result = self._apply_automaton(result, automaton, case_insensitive)
+            return result
+
+        for rule in self.replacements:
+            if rule['regex'] or rule['find'] in self._table_chars:
+                continue
+            result, _ = self._apply_rule(result, rule)
+
+        return result
+
     def process_text(self, text: str) -> str:
         """Apply all replacement rules to text"""
-        result = text
-        
+        result = self._apply_literal_rules(text)
+
         for rule in self.replacements:
             if rule['regex']:
-                flags = re.IGNORECASE if rule.get('caseInsensitive', False) else 0
-                result = re.sub(rule['find'], rule['replace'], result, flags=flags)
-            else:
-                if rule.get('caseInsensitive', False):
-                    # For case insensitive string replacement, we need to find all occurrences
-                    # while preserving the original case of the surrounding text
-                    find_text = rule['find']
-                    replace_text = rule['replace']
-                    result_lower = result.lower()
-                    find_lower = find_text.lower()
-                    
-                    # Find all positions where the text occurs (case insensitive)
-                    new_result = ""
-                    last_pos = 0
-                    pos = result_lower.find(find_lower)
-                    
-                    while pos != -1:
-                        # Add text before the match
-                        new_result += result[last_pos:pos]
-                        # Add the replacement
-                        new_result += replace_text
-                        # Move past the match
-                        last_pos = pos + len(find_text)
-                        # Find next occurrence
-                        pos = result_lower.find(find_lower, last_pos)
-                    
-                    # Add remaining text
-                    new_result += result[last_pos:]
-                    result = new_result
-                else:
-                    result = result.replace(rule['find'], rule['replace'])
-        
+                result, _ = self._apply_rule(result, rule)
+
+        if self._char_table is not None and self._table_after_regex:
+            # Deferred from the literal pass: translating single chars
+            # first would destroy matches the regex rules need (a
+            # "1"->"*" rule must not break \d{3}-\d{2}-\d{4})
+            result = result.translate(self._char_table)
+
         return result
     
+    @staticmethod
+    def _link_or_copy(src: str, dst: str):
+        """Hardlink src to dst when possible, falling back to a real copy"""
+        try:
+            if Path(dst).exists():
+                os.unlink(dst)
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+
+    @staticmethod
+    def _file_digest(path: str) -> str:
+        """SHA-256 of a file, streamed in 1 MiB chunks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _open_pdftotext(self, pdf_path: str) -> subprocess.Popen:
+        """Start pdftotext writing to a pipe instead of a memory buffer"""
+        return subprocess.Popen(
+            ['pdftotext', '-layout', pdf_path, '-'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=1 << 20
+        )
+
     def extract_text(self, pdf_path: str) -> str:
         """Extract text from PDF using pdftotext"""
+        proc = self._open_pdftotext(pdf_path)
+        stream = io.TextIOWrapper(proc.stdout, encoding='utf-8', errors='replace')
+        chunks = []
+        for chunk in iter(lambda: stream.read(1 << 20), ''):
+            chunks.append(chunk)
+        if proc.wait() != 0:
+            logger.error(f"Error extracting text: pdftotext exited with {proc.returncode}")
+            return ""
+        return ''.join(chunks)
+
+    def extract_text_pages(self, pdf_path: str, first: int, last: int) -> Optional[str]:
+        """Extract text for a page range using pdftotext -f/-l
+
+        Returns None when extraction fails (including ranges past the end
+        of the document).
+        """
+        proc = subprocess.Popen(
+            ['pdftotext', '-layout', '-f', str(first), '-l', str(last),
+             pdf_path, '-'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=1 << 20
+        )
+        out = proc.stdout.read()
+        if proc.wait() != 0:
+            return None
+        return out.decode('utf-8', errors='replace')
+
+    def _page_count(self, pdf_path: str) -> Optional[int]:
+        """Page count via pdfinfo (ships with pdftotext in poppler-utils)"""
         try:
             result = subprocess.run(
-                ['pdftotext', '-layout', pdf_path, '-'],
-                capture_output=True,
-                text=True,
-                check=True
+                ['pdfinfo', pdf_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
             )
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            logger.error(f"Error extracting text: {e}")
-            return ""
+        except OSError:
+            return None
+        if result.returncode != 0:
+            return None
+        for line in result.stdout.decode('utf-8', errors='replace').splitlines():
+            if line.startswith('Pages:'):
+                try:
+                    return int(line.split()[1])
+                except (IndexError, ValueError):
+                    return None
+        return None
+
+    def _stream_has_matches(self, pdf_path: str) -> bool:
+        """Scan extracted text in page batches, returning True on first hit
+
+        Avoids materializing the full document text just to decide whether
+        any replacement applies: pages are extracted ten at a time so a hit
+        on page 3 of a 500-page PDF skips extraction of the remaining 497.
+        Batches overlap by the longest literal pattern so matches cannot be
+        lost at batch boundaries; when regex rules are present (unbounded
+        match length) or the page count is unknown, the scan falls back to
+        the full extracted text.
+        """
+        if any(rule['regex'] for rule in self.replacements):
+            return self._any_match(self.extract_text(pdf_path))
+
+        pages = self._page_count(pdf_path)
+        if pages is None:
+            return self._any_match(self.extract_text(pdf_path))
+
+        literal_lengths = [len(r['find']) for r in self.replacements]
+        overlap = max(literal_lengths, default=1) - 1
+
+        carry = ''
+        for first in range(1, pages + 1, 10):
+            text = self.extract_text_pages(pdf_path, first, min(first + 9, pages))
+            if text is None:
+                # Extraction hiccup mid-document; rescan everything rather
+                # than risk missing a match
+                return self._any_match(self.extract_text(pdf_path))
+            window = carry + text
+            if self._any_match(window):
+                return True
+            carry = window[-overlap:] if overlap else ''
+        return False
     
     def pdf_to_ps(self, pdf_path: str, ps_path: str) -> bool:
         """Convert PDF to PostScript"""
@@ -134,7 +469,8 @@ class PDFRedactorTools:
             subprocess.run(
                 ['pdf2ps', pdf_path, ps_path],
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
             return True
         except subprocess.CalledProcessError as e:
@@ -160,7 +496,8 @@ class PDFRedactorTools:
             
             cmd.extend([ps_path, pdf_path])
             
-            subprocess.run(cmd, check=True, capture_output=True)
+            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL,
+                           stderr=subprocess.PIPE)
             return True
         except subprocess.CalledProcessError as e:
             logger.error(f"Error converting to PDF: {e}")
@@ -173,7 +510,8 @@ class PDFRedactorTools:
                 ['qpdf', '--stream-data=uncompress', '--decode-level=all', 
                  input_path, output_path],
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
             return True
         except subprocess.CalledProcessError as e:
@@ -187,7 +525,8 @@ class PDFRedactorTools:
                 ['qpdf', '--compress-streams=y', '--object-streams=generate',
                  input_path, output_path],
                 check=True,
-                capture_output=True
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
             )
             return True
         except subprocess.CalledProcessError as e:
@@ -197,25 +536,31 @@ class PDFRedactorTools:
     def process_postscript(self, ps_path: str) -> bool:
         """Process PostScript file to replace text"""
         try:
-            # Read the PostScript file
-            with open(ps_path, 'r', encoding='latin-1') as f:
-                content = f.read()
-            
-            # Apply replacements
-            modified = False
-            for rule in self.replacements:
-                if rule['regex']:
-                    new_content = re.sub(rule['find'], rule['replace'], content)
-                else:
-                    new_content = content.replace(rule['find'], rule['replace'])
-                
-                if new_content != content:
-                    modified = True
-                    content = new_content
-            
+            # Memory-map the file and probe for matches against the kernel
+            # page cache first; the full buffer is only copied into a bytes
+            # object when at least one rule actually fires. The replacement
+            # rules have precomputed latin-1 byte twins, so everything runs
+            # on raw bytes with no decode/encode round-trip.
+            with open(ps_path, 'r+b') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    logger.info("No text replacements were needed")
+                    return True
+
+                mm = mmap.mmap(f.fileno(), 0)
+                try:
+                    if not self._buffer_has_matches(mm):
+                        logger.info("No text replacements were needed")
+                        return True
+                    content = mm[:]
+                finally:
+                    mm.close()
+
+            content, modified = self.process_pdf_stream(content)
+
             if modified:
                 # Write back the modified content
-                with open(ps_path, 'w', encoding='latin-1') as f:
+                with open(ps_path, 'wb') as f:
                     f.write(content)
                 logger.info("Text replacements applied successfully")
             else:
@@ -227,66 +572,217 @@ class PDFRedactorTools:
             logger.error(f"Error processing PostScript: {e}")
             return False
     
-    def redact_pdf(self, input_path: str, output_path: str) -> bool:
-        """Process a single PDF file using external tools"""
-        logger.info(f"Processing: {input_path}")
-        
-        # Create temporary directory
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_path = Path(temp_dir)
-            
-            # Step 1: Extract text to see what needs redaction
-            text_content = self.extract_text(input_path)
-            processed_text = self.process_text(text_content)
-            
-            if processed_text == text_content:
-                logger.info("No replacements needed, copying file as-is")
-                shutil.copy2(input_path, output_path)
-                return True
-            
-            logger.info("Text replacements needed, processing PDF...")
-            
-            # Step 2: Decompress PDF
-            decompressed_pdf = temp_path / "decompressed.pdf"
-            if not self.decompress_pdf(input_path, str(decompressed_pdf)):
-                logger.warning("Failed to decompress, using original")
-                decompressed_pdf = input_path
-            
-            # Step 3: Convert to PostScript
-            ps_file = temp_path / "document.ps"
-            if not self.pdf_to_ps(str(decompressed_pdf), str(ps_file)):
-                logger.error("Failed to convert to PostScript")
+    def process_pdf_stream(self, data: bytes) -> Tuple[bytes, bool]:
+        """Apply replacement rules to an uncompressed PDF byte stream
+
+        With streams decompressed by qpdf, text operators sit as mostly
+        ASCII content between BT/ET markers, so the rules can run directly
+        on the bytes. Patterns that cannot be encoded as latin-1 cannot
+        occur literally in the stream and are skipped.
+        """
+        modified = False
+
+        # All literal rules collapse into one alternation pattern, so the
+        # buffer is scanned once instead of once per rule
+        pattern, replace_map = self._get_combined_literal_b()
+        if pattern is not None:
+            new_data = pattern.sub(
+                lambda m: replace_map[int(m.lastgroup[1:])], data)
+            if new_data != data:
+                modified = True
+                data = new_data
+
+        data, regex_modified = self._apply_regex_rules_bytes(data)
+        return data, modified or regex_modified
+
+    def _apply_regex_rules_bytes(self, data: bytes) -> Tuple[bytes, bool]:
+        """Apply all regex rules to a byte buffer
+
+        With hyperscan available (and every rule expressible as a literal
+        replacement) all patterns compile into one DFA scanned in a single
+        pass; otherwise each rule runs through _apply_rule_bytes.
+        """
+        modified = False
+        db, replace_map = self._get_hyperscan_db()
+        if db is not None:
+            matches = []
+            db.scan(data, match_event_handler=(
+                lambda id_, start, end, flags, ctx: matches.append((start, end, id_))))
+            if matches:
+                # Resolve overlaps left-to-right, longest match wins
+                matches.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+                parts = []
+                pos = 0
+                for start, end, id_ in matches:
+                    if start < pos:
+                        continue
+                    parts.append(data[pos:start])
+                    parts.append(replace_map[id_])
+                    pos = end
+                parts.append(data[pos:])
+                data = b''.join(parts)
+                modified = True
+            return data, modified
+
+        for rule in self.replacements:
+            if not rule['regex']:
+                continue
+            data, changed = self._apply_rule_bytes(data, rule)
+            if changed:
+                modified = True
+        return data, modified
+
+    def _get_hyperscan_db(self):
+        """Hyperscan database over all regex rules, or (None, None)
+
+        Unavailable when hyperscan is not installed, a pattern cannot be
+        encoded for the byte path, a replacement uses backreferences
+        (hyperscan only reports match positions), or a pattern uses
+        constructs hyperscan cannot compile.
+        """
+        if self._hs_db is None:
+            self._hs_db = (None, None)
+            regex_rules = [r for r in self.replacements if r['regex']]
+            if hyperscan is not None and regex_rules:
+                usable = all(
+                    r['_find_b'] is not None
+                    and not re.search(r'\\\d|\\g<', r['replace'])
+                    for r in regex_rules)
+                if usable:
+                    db = hyperscan.Database()
+                    try:
+                        db.compile(
+                            expressions=[r['_find_b'] for r in regex_rules],
+                            ids=list(range(len(regex_rules))),
+                            flags=[hyperscan.HS_FLAG_SOM_LEFTMOST |
+                                   (hyperscan.HS_FLAG_CASELESS
+                                    if r.get('caseInsensitive', False) else 0)
+                                   for r in regex_rules])
+                    except hyperscan.error:
+                        pass
+                    else:
+                        self._hs_db = (db, [r['_replace_b'] for r in regex_rules])
+        return self._hs_db
+
+    def _get_combined_literal_b(self):
+        """Combined alternation pattern over all literal rules (byte form)
+
+        Each rule becomes a named group (case-insensitive ones via an
+        inline (?i:...) flag) so a single scan of the buffer dispatches to
+        the right replacement through the group index.
+        """
+        if self._combined_literal_b is None:
+            parts = []
+            replace_map = []
+            for rule in self.replacements:
+                if rule['regex'] or rule['_find_b'] is None:
+                    continue
+                escaped = re.escape(rule['_find_b'])
+                if rule.get('caseInsensitive', False):
+                    escaped = b'(?i:' + escaped + b')'
+                group = 'r%d' % len(replace_map)
+                parts.append(b'(?P<' + group.encode('ascii') + b'>' + escaped + b')')
+                replace_map.append(rule['_replace_b'])
+            pattern = re.compile(b'|'.join(parts)) if parts else None
+            self._combined_literal_b = (pattern, replace_map)
+        return self._combined_literal_b
+
+    def _redact_via_postscript(self, input_path: str, output_path: str) -> bool:
+        """Fallback: redact through the pdf2ps/ps2pdf round-trip
+
+        Ghostscript re-emits text operators as plain strings, so rules
+        that cannot fire on the qpdf byte stream (hex-string or
+        subset/CID-encoded text) still apply here. It costs two
+        ghostscript re-interpretations and can degrade embedded fonts,
+        which is why the stream edit is tried first. The output is
+        re-scanned afterwards; a file that still matches is reported as a
+        failure rather than shipped.
+        """
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            ps_path = os.path.join(tmp_dir, 'work.ps')
+            if not self.pdf_to_ps(input_path, ps_path):
                 return False
-            
-            # Step 4: Process PostScript file
-            if not self.process_postscript(str(ps_file)):
-                logger.error("Failed to process PostScript")
+            if not self.process_postscript(ps_path):
                 return False
-            
-            # Step 5: Convert back to PDF
-            processed_pdf = temp_path / "processed.pdf"
-            if not self.ps_to_pdf(str(ps_file), str(processed_pdf)):
-                logger.error("Failed to convert back to PDF")
+            if not self.ps_to_pdf(ps_path, output_path):
                 return False
-            
-            # Step 6: Final compression/optimization
-            subprocess.run(
-                ['qpdf', '--linearize', str(processed_pdf), output_path],
-                check=True,
-                capture_output=True
-            )
-            
-            # Log size comparison
-            original_size = Path(input_path).stat().st_size
-            final_size = Path(output_path).stat().st_size
-            size_diff = final_size - original_size
-            size_pct = (size_diff / original_size) * 100 if original_size > 0 else 0
-            
-            logger.info(f"Original size: {original_size:,} bytes")
-            logger.info(f"Final size: {final_size:,} bytes ({size_pct:+.1f}%)")
-            logger.info(f"Successfully created: {output_path}")
-            
+        if self._stream_has_matches(output_path):
+            logger.error(f"Redaction did not remove all matches from "
+                         f"{output_path}; treating as failure")
+            return False
+        logger.info(f"Successfully created: {output_path}")
+        return True
+
+    def redact_pdf(self, input_path: str, output_path: str) -> bool:
+        """Process a single PDF file using external tools"""
+        logger.info(f"Processing: {input_path}")
+
+        # Step 1: Stream-scan extracted text to see what needs redaction
+        if not self._stream_has_matches(input_path):
+            logger.info("No replacements needed, copying file as-is")
+            # Hardlink when possible (same filesystem): O(1) and zero
+            # bytes copied. Fall back to a real copy otherwise.
+            self._link_or_copy(input_path, output_path)
             return True
+
+        logger.info("Text replacements needed, processing PDF...")
+
+        # Step 2: Decompress straight to a pipe so the editable byte stream
+        # never touches disk. This skips the old pdf2ps/ps2pdf round-trip,
+        # which cost two ghostscript re-interpretations of the document and
+        # degraded embedded fonts.
+        decompress = subprocess.Popen(
+            ['qpdf', '--stream-data=uncompress', '--decode-level=all',
+             input_path, '-'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        data = decompress.stdout.read()
+        # qpdf exits 3 when it wrote output despite warnings
+        if decompress.wait() not in (0, 3) or not data:
+            # Feeding the still-compressed original into the byte editor
+            # would be a guaranteed no-op; take the PostScript route
+            logger.warning("Failed to decompress, falling back to the "
+                           "PostScript pipeline")
+            return self._redact_via_postscript(input_path, output_path)
+
+        # Step 3: Edit the decompressed byte stream in memory
+        data, modified = self.process_pdf_stream(data)
+        if not modified:
+            # The scan gate proved this document matches, but the byte
+            # editor could not touch it - text drawn with hex-string or
+            # subset/CID-encoded operators never matches the latin-1
+            # literals. Shipping the input as a successful output would
+            # leak everything the gate found.
+            logger.warning("Stream edit changed nothing despite matches; "
+                           "falling back to the PostScript pipeline")
+            return self._redact_via_postscript(input_path, output_path)
+
+        # Step 4: Recompress and linearize from stdin; qpdf also repairs
+        # stream lengths and the xref table shifted by the replacements
+        compress = subprocess.Popen(
+            ['qpdf', '--compress-streams=y', '--object-streams=generate',
+             '--linearize', '-', output_path],
+            stdin=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+        _, stderr = compress.communicate(data)
+        if compress.returncode not in (0, 3):
+            logger.error(f"Failed to rebuild output PDF: "
+                         f"{stderr.decode(errors='replace').strip()}")
+            return False
+
+        # Log size comparison
+        original_size = Path(input_path).stat().st_size
+        final_size = Path(output_path).stat().st_size
+        size_diff = final_size - original_size
+        size_pct = (size_diff / original_size) * 100 if original_size > 0 else 0
+
+        logger.info(f"Original size: {original_size:,} bytes")
+        logger.info(f"Final size: {final_size:,} bytes ({size_pct:+.1f}%)")
+        logger.info(f"Successfully created: {output_path}")
+
+        return True
     
     def process_directory(self, input_dir: str, output_dir: str):
         """Process all PDFs in a directory"""
@@ -299,16 +795,63 @@ class PDFRedactorTools:
         # Process all PDF files
         pdf_files = list(input_path.glob("*.pdf"))
         logger.info(f"Found {len(pdf_files)} PDF files to process")
-        
-        success_count = 0
+
+        # Deduplicate byte-identical inputs (dedupe sets, backups) so the
+        # pipeline runs once per unique document; duplicates are linked to
+        # the representative's output afterwards.
+        jobs = []
+        duplicates = []  # (duplicate output, representative output)
+        outputs_by_digest: Dict[str, Path] = {}
         for pdf_file in pdf_files:
             output_file = output_path / pdf_file.name
-            if self.redact_pdf(str(pdf_file), str(output_file)):
+            file_digest = self._file_digest(str(pdf_file))
+            if file_digest in outputs_by_digest:
+                duplicates.append((output_file, outputs_by_digest[file_digest]))
+            else:
+                outputs_by_digest[file_digest] = output_file
+                jobs.append((str(pdf_file), str(output_file), self.replacements))
+
+        if duplicates:
+            logger.info(f"Skipping {len(duplicates)} duplicate files")
+
+        # Each redact_pdf call is an independent subprocess pipeline, so
+        # files can be processed in parallel. Workers are capped at the CPU
+        # count; each one runs several external tools, so very high worker
+        # counts can exhaust the open-file limit.
+        if len(jobs) > 1:
+            workers = min(len(jobs), os.cpu_count() or 1)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(_redact_worker, jobs))
+        else:
+            results = [_redact_worker(job) for job in jobs]
+
+        success_by_output = {Path(job[1]): result for job, result in zip(jobs, results)}
+        success_count = sum(1 for result in results if result)
+
+        for output_file, source_output in duplicates:
+            if success_by_output.get(source_output):
+                self._link_or_copy(str(source_output), str(output_file))
                 success_count += 1
-        
+
         logger.info(f"Successfully processed {success_count}/{len(pdf_files)} files")
 
 
+def _redact_worker(args: Tuple[str, str, List[Dict]]) -> bool:
+    """Process one PDF in a worker process
+
+    Rebuilds a redactor from the pickled replacement rules; tool checking is
+    skipped since the parent process already verified the tools exist.
+    """
+    input_path, output_path, replacements = args
+    redactor = PDFRedactorTools(check_tools=False)
+    for rule in replacements:
+        redactor.add_replacement(
+            rule['find'], rule['replace'],
+            rule['regex'], rule.get('caseInsensitive', False)
+        )
+    return redactor.redact_pdf(input_path, output_path)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Replace sensitive data in PDF files using external tools",